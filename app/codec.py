@@ -0,0 +1,18 @@
+"""JSON encoding for WebSocket frames, backed by orjson."""
+
+import orjson
+from fastapi import WebSocket
+
+
+def encode(msg_dict: dict) -> str:
+    return orjson.dumps(msg_dict).decode()
+
+
+async def recv(ws: WebSocket):
+    """Receive a text frame and decode it as JSON."""
+    return orjson.loads(await ws.receive_text())
+
+
+async def send(ws: WebSocket, msg_dict: dict):
+    """Encode a message and send it as a text frame."""
+    await ws.send_text(encode(msg_dict))
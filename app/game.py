@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import random
+
 BOARD_SIZE = 15
+MAX_MOVES = BOARD_SIZE * BOARD_SIZE
 
 # Four directions: horizontal, vertical, diagonal ↘, diagonal ↗
 DIRECTIONS = [
@@ -13,13 +16,99 @@ DIRECTIONS = [
 ]
 
 
+def _neighbors(idx: int) -> tuple[tuple[tuple[int, ...], tuple[int, ...]], ...]:
+    """For each direction, the bit masks of up to 4 on-board cells ahead of and behind idx."""
+    row, col = divmod(idx, BOARD_SIZE)
+    lines = []
+    for dr, dc in DIRECTIONS:
+        sides = []
+        for sign in (1, -1):
+            masks = []
+            for i in range(1, 5):
+                r, c = row + sign * dr * i, col + sign * dc * i
+                if r < 0 or r >= BOARD_SIZE or c < 0 or c >= BOARD_SIZE:
+                    break
+                masks.append(1 << (r * BOARD_SIZE + c))
+            sides.append(tuple(masks))
+        lines.append((sides[0], sides[1]))
+    return tuple(lines)
+
+
+# (forward, backward) neighbor masks per direction, keyed by flattened cell index
+NEIGHBORS = [_neighbors(idx) for idx in range(BOARD_SIZE * BOARD_SIZE)]
+
+# Zobrist keys per cell: (black, white). Fixed seed keeps hashes stable across restarts.
+_zobrist_rng = random.Random(0xC0FFEE)
+ZOBRIST = [
+    (_zobrist_rng.getrandbits(64), _zobrist_rng.getrandbits(64))
+    for _ in range(BOARD_SIZE * BOARD_SIZE)
+]
+
+# (black bit, white bit) -> state_sync board char
+CELL_CHARS = {"00": ".", "10": "B", "01": "W"}
+
+
+def has_five(stones: int, idx: int) -> bool:
+    """Check if the stone at idx is part of five-in-a-row on the bitboard stones."""
+    for forward, backward in NEIGHBORS[idx]:
+        count = 1
+
+        # Extend in positive direction
+        for bit in forward:
+            if not stones & bit:
+                break
+            count += 1
+
+        # Extend in negative direction
+        for bit in backward:
+            if not stones & bit:
+                break
+            count += 1
+
+        if count >= 5:
+            return True
+
+    return False
+
+
 class GameState:
+    __slots__ = (
+        "black",
+        "white",
+        "current_turn",
+        "move_count",
+        "is_game_over",
+        "winner",
+        "hash",
+        "_board_string_cache",
+    )
+
     def __init__(self):
-        self.board: list[list[str | None]] = [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        # Bitboards: bit ``row * BOARD_SIZE + col`` is set when that cell holds a stone
+        self.black: int = 0
+        self.white: int = 0
         self.current_turn: str = "black"
         self.move_count: int = 0
         self.is_game_over: bool = False
         self.winner: str | None = None
+        # Zobrist hash of the position, updated incrementally by place_stone
+        self.hash: int = 0
+        self._board_string_cache: tuple[int, str] | None = None
+
+    def board_string(self) -> str:
+        """Row-major board as one char per cell: '.' empty, 'B' black, 'W' white.
+
+        Cached by position hash, so repeated state_sync for an unchanged board
+        reuses the same string.
+        """
+        cached = self._board_string_cache
+        if cached is not None and cached[0] == self.hash:
+            return cached[1]
+        black = format(self.black, f"0{BOARD_SIZE * BOARD_SIZE}b")[::-1]
+        white = format(self.white, f"0{BOARD_SIZE * BOARD_SIZE}b")[::-1]
+        board = "".join(CELL_CHARS[b + w] for b, w in zip(black, white))
+        self._board_string_cache = (self.hash, board)
+        return board
 
     def validate_move(self, row: int, col: int, color: str) -> str | None:
         """Return an error message if the move is invalid, or None if valid."""
@@ -29,21 +118,27 @@ class GameState:
             return "Not your turn"
         if row < 0 or row >= BOARD_SIZE or col < 0 or col >= BOARD_SIZE:
             return "Coordinates out of bounds"
-        if self.board[row][col] is not None:
+        if (self.black | self.white) >> (row * BOARD_SIZE + col) & 1:
             return "Cell is already occupied"
         return None
 
     def place_stone(self, row: int, col: int, color: str) -> bool:
         """Place a stone and check for win/draw. Returns True if game ends."""
-        self.board[row][col] = color
+        idx = row * BOARD_SIZE + col
+        if color == "black":
+            self.black |= 1 << idx
+            self.hash ^= ZOBRIST[idx][0]
+        else:
+            self.white |= 1 << idx
+            self.hash ^= ZOBRIST[idx][1]
         self.move_count += 1
 
-        if self.check_win(row, col):
+        if self.check_win(idx, color):
             self.is_game_over = True
             self.winner = color
             return True
 
-        if self.is_draw():
+        if self.move_count >= MAX_MOVES:
             self.is_game_over = True
             self.winner = None
             return True
@@ -52,37 +147,9 @@ class GameState:
         self.current_turn = "white" if color == "black" else "black"
         return False
 
-    def check_win(self, row: int, col: int) -> bool:
-        """Check if the last move at (row, col) creates five-in-a-row."""
-        color = self.board[row][col]
-        if color is None:
-            return False
-
-        for dr, dc in DIRECTIONS:
-            count = 1
-
-            # Extend in positive direction
-            for i in range(1, 5):
-                r, c = row + dr * i, col + dc * i
-                if r < 0 or r >= BOARD_SIZE or c < 0 or c >= BOARD_SIZE:
-                    break
-                if self.board[r][c] != color:
-                    break
-                count += 1
-
-            # Extend in negative direction
-            for i in range(1, 5):
-                r, c = row - dr * i, col - dc * i
-                if r < 0 or r >= BOARD_SIZE or c < 0 or c >= BOARD_SIZE:
-                    break
-                if self.board[r][c] != color:
-                    break
-                count += 1
-
-            if count >= 5:
-                return True
-
-        return False
+    def check_win(self, idx: int, color: str) -> bool:
+        """Check if the last move at flattened index idx creates five-in-a-row."""
+        return has_five(self.black if color == "black" else self.white, idx)
 
     def is_draw(self) -> bool:
-        return self.move_count >= BOARD_SIZE * BOARD_SIZE
+        return self.move_count >= MAX_MOVES
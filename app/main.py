@@ -1,14 +1,24 @@
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.room import room_manager
 from app.ws_handler import router as ws_router
 
 load_dotenv()
 
-app = FastAPI(title="Gomoku Server")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    room_manager.start_reaper()
+    yield
+    await room_manager.stop_reaper()
+
+
+app = FastAPI(title="Gomoku Server", lifespan=lifespan)
 
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:5174")
 app.add_middleware(
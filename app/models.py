@@ -41,6 +41,9 @@ ClientMessage = CreateRoomMsg | JoinRoomMsg | PlaceStoneMsg | LeaveRoomMsg | Rec
 
 # ---------------------------------------------------------------------------
 # Server → Client
+#
+# room_created, stone_placed, game_over and turn_timer are sent as literal
+# dicts from room.py to skip validation on the hot path; keep both in sync.
 # ---------------------------------------------------------------------------
 
 class RoomCreatedMsg(BaseModel):
@@ -76,7 +79,7 @@ class GameOverMsg(BaseModel):
 
 class StateSyncMsg(BaseModel):
     type: Literal["state_sync"] = "state_sync"
-    board: list[list[str | None]]
+    board: str  # BOARD_SIZE * BOARD_SIZE chars, row-major: "." | "B" | "W"
     current_turn: str
     move_count: int
     your_color: str
@@ -86,6 +89,7 @@ class StateSyncMsg(BaseModel):
 class TurnTimerMsg(BaseModel):
     type: Literal["turn_timer"] = "turn_timer"
     remaining: float
+    deadline: float  # Unix timestamp (seconds) when the current turn times out
 
 
 class OpponentDisconnectedMsg(BaseModel):
@@ -101,17 +105,51 @@ class ErrorMsg(BaseModel):
     message: str
 
 
+# ---------------------------------------------------------------------------
+# Pre-built payloads for messages with a small, fixed set of values
+# ---------------------------------------------------------------------------
+
+OPP_DISCONNECTED_DICT = OpponentDisconnectedMsg().model_dump()
+OPP_RECONNECTED_DICT = OpponentReconnectedMsg().model_dump()
+GAME_STARTED_DICTS = {
+    color: GameStartedMsg(your_color=color).model_dump() for color in ("black", "white")
+}
+
+
+CLIENT_MESSAGES: dict[str, type[BaseModel]] = {
+    "create_room": CreateRoomMsg,
+    "join_room": JoinRoomMsg,
+    "place_stone": PlaceStoneMsg,
+    "leave_room": LeaveRoomMsg,
+    "reconnect": ReconnectMsg,
+}
+
+
 def parse_client_message(data: dict) -> ClientMessage | None:
-    """Parse a raw dict into a typed client message, or None if invalid."""
+    """Parse a raw dict into a typed client message, or None if invalid.
+
+    Well-formed payloads are built with ``model_construct`` after explicit type
+    checks; anything else falls back to full Pydantic validation.
+    """
     msg_type = data.get("type")
-    mapping: dict[str, type[BaseModel]] = {
-        "create_room": CreateRoomMsg,
-        "join_room": JoinRoomMsg,
-        "place_stone": PlaceStoneMsg,
-        "leave_room": LeaveRoomMsg,
-        "reconnect": ReconnectMsg,
-    }
-    model = mapping.get(msg_type)  # type: ignore[arg-type]
+    if msg_type == "place_stone":
+        row, col = data.get("row"), data.get("col")
+        if type(row) is int and type(col) is int:
+            return PlaceStoneMsg.model_construct(row=row, col=col)
+    elif msg_type == "join_room":
+        room_id = data.get("room_id")
+        if type(room_id) is str:
+            return JoinRoomMsg.model_construct(room_id=room_id)
+    elif msg_type == "create_room":
+        return CreateRoomMsg.model_construct()
+    elif msg_type == "leave_room":
+        return LeaveRoomMsg.model_construct()
+    elif msg_type == "reconnect":
+        room_id, player_token = data.get("room_id"), data.get("player_token")
+        if type(room_id) is str and type(player_token) is str:
+            return ReconnectMsg.model_construct(room_id=room_id, player_token=player_token)
+
+    model = CLIENT_MESSAGES.get(msg_type)  # type: ignore[arg-type]
     if model is None:
         return None
     try:
@@ -3,48 +3,49 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import secrets
 import time
 from dataclasses import dataclass, field
-from uuid import uuid4
 
 from fastapi import WebSocket
 
+from app.codec import encode, send
 from app.game import GameState
 from app.models import (
+    GAME_STARTED_DICTS,
+    OPP_DISCONNECTED_DICT,
+    OPP_RECONNECTED_DICT,
     ErrorMsg,
-    GameOverMsg,
-    GameStartedMsg,
-    OpponentDisconnectedMsg,
-    OpponentReconnectedMsg,
     PlayerJoinedMsg,
-    RoomCreatedMsg,
     StateSyncMsg,
-    StonePlacedMsg,
-    TurnTimerMsg,
 )
 
 TURN_TIMEOUT = 30  # seconds
-TIMER_INTERVAL = 5  # seconds between turn_timer pushes
+RECONNECT_TIMEOUT = 60  # seconds a disconnected player has to reconnect
+REAPER_INTERVAL = 5  # seconds between sweeps for expired disconnects
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     ws: WebSocket
     token: str
     color: str  # "black" | "white"
     connected: bool = True
+    disconnect_deadline: float = 0.0  # time.monotonic() deadline, 0.0 while connected
 
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     room_id: str
-    players: list[Player] = field(default_factory=list)
+    black: Player | None = None
+    white: Player | None = None
     game: GameState = field(default_factory=GameState)
     game_started: bool = False
     turn_timer_task: asyncio.Task | None = field(default=None, repr=False)
     turn_timer_start: float = 0.0
-    disconnect_tasks: dict[str, asyncio.Task] = field(default_factory=dict, repr=False)
+    _by_token: dict[str, Player] = field(default_factory=dict, init=False, repr=False)
+    _by_ws: dict[WebSocket, Player] = field(default_factory=dict, init=False, repr=False)
 
     @property
     def timer_remaining(self) -> float:
@@ -53,36 +54,43 @@ class Room:
         elapsed = time.monotonic() - self.turn_timer_start
         return max(TURN_TIMEOUT - elapsed, 0.0)
 
+    def add_player(self, player: Player):
+        if player.color == "black":
+            self.black = player
+        else:
+            self.white = player
+        self._by_token[player.token] = player
+        self._by_ws[player.ws] = player
+
+    def rebind_ws(self, player: Player, ws: WebSocket):
+        """Point a reconnecting player at their new WebSocket."""
+        self._by_ws.pop(player.ws, None)
+        player.ws = ws
+        self._by_ws[ws] = player
+
     def get_player_by_token(self, token: str) -> Player | None:
-        for p in self.players:
-            if p.token == token:
-                return p
-        return None
+        return self._by_token.get(token)
 
     def get_player_by_ws(self, ws: WebSocket) -> Player | None:
-        for p in self.players:
-            if p.ws is ws:
-                return p
-        return None
+        return self._by_ws.get(ws)
 
     def get_opponent(self, player: Player) -> Player | None:
-        for p in self.players:
-            if p is not player:
-                return p
-        return None
+        return self.white if player is self.black else self.black
 
     async def broadcast(self, msg_dict: dict):
-        for p in self.players:
-            if p.connected:
-                try:
-                    await p.ws.send_json(msg_dict)
-                except Exception:
-                    pass
+        # Encode once and send the same text frame to every player concurrently;
+        # a failed send to one player must not block the other
+        payload = encode(msg_dict)
+        recipients = [p for p in (self.black, self.white) if p is not None and p.connected]
+        await asyncio.gather(
+            *(p.ws.send_text(payload) for p in recipients),
+            return_exceptions=True,
+        )
 
     async def send_to(self, player: Player, msg_dict: dict):
         if player.connected:
             try:
-                await player.ws.send_json(msg_dict)
+                await send(player.ws, msg_dict)
             except Exception:
                 pass
 
@@ -90,7 +98,7 @@ class Room:
 class RoomManager:
     def __init__(self):
         self.rooms: dict[str, Room] = {}
-        self._ws_to_room: dict[WebSocket, str] = {}
+        self._reaper_task: asyncio.Task | None = None
 
     def _generate_room_id(self) -> str:
         while True:
@@ -102,61 +110,62 @@ class RoomManager:
         room_id = self._generate_room_id()
         room = Room(room_id=room_id)
 
-        token = str(uuid4())
+        token = secrets.token_urlsafe(16)
         player = Player(ws=ws, token=token, color="black")
-        room.players.append(player)
+        room.add_player(player)
 
         self.rooms[room_id] = room
-        self._ws_to_room[ws] = room_id
+        ws.state.room_id = room_id
 
-        await ws.send_json(
-            RoomCreatedMsg(room_id=room_id, player_token=token, color="black").model_dump()
+        await send(
+            ws,
+            {"type": "room_created", "room_id": room_id, "player_token": token, "color": "black"},
         )
         return room
 
     async def join_room(self, ws: WebSocket, room_id: str) -> Room | None:
         room = self.rooms.get(room_id)
         if room is None:
-            await ws.send_json(ErrorMsg(message="Room not found").model_dump())
+            await send(ws, ErrorMsg(message="Room not found").model_dump())
             return None
-        if len(room.players) >= 2:
-            await ws.send_json(ErrorMsg(message="Room is full").model_dump())
+        if room.white is not None:
+            await send(ws, ErrorMsg(message="Room is full").model_dump())
             return None
         if room.game.is_game_over:
-            await ws.send_json(ErrorMsg(message="Game already ended").model_dump())
+            await send(ws, ErrorMsg(message="Game already ended").model_dump())
             return None
 
-        token = str(uuid4())
+        token = secrets.token_urlsafe(16)
         player = Player(ws=ws, token=token, color="white")
-        room.players.append(player)
-        self._ws_to_room[ws] = room_id
+        room.add_player(player)
+        ws.state.room_id = room_id
 
         # Notify the new player
-        await ws.send_json(
-            RoomCreatedMsg(room_id=room_id, player_token=token, color="white").model_dump()
+        await send(
+            ws,
+            {"type": "room_created", "room_id": room_id, "player_token": token, "color": "white"},
         )
 
         # Notify the first player that someone joined
-        host = room.players[0]
-        await room.send_to(host, PlayerJoinedMsg(color="white").model_dump())
+        await room.send_to(room.black, PlayerJoinedMsg(color="white").model_dump())
 
         # Start the game
         room.game_started = True
-        for p in room.players:
-            await room.send_to(p, GameStartedMsg(your_color=p.color).model_dump())
+        await room.send_to(room.black, GAME_STARTED_DICTS["black"])
+        await room.send_to(player, GAME_STARTED_DICTS["white"])
 
         # Start turn timer for black's first move
-        self._start_turn_timer(room)
+        await self._start_turn_timer(room)
 
         return room
 
     async def place_stone(self, ws: WebSocket, row: int, col: int):
         room = self.get_room_for_ws(ws)
         if room is None:
-            await ws.send_json(ErrorMsg(message="Not in a room").model_dump())
+            await send(ws, ErrorMsg(message="Not in a room").model_dump())
             return
         if not room.game_started:
-            await ws.send_json(ErrorMsg(message="Game not started yet").model_dump())
+            await send(ws, ErrorMsg(message="Game not started yet").model_dump())
             return
 
         player = room.get_player_by_ws(ws)
@@ -165,7 +174,7 @@ class RoomManager:
 
         error = room.game.validate_move(row, col, player.color)
         if error:
-            await ws.send_json(ErrorMsg(message=error).model_dump())
+            await send(ws, ErrorMsg(message=error).model_dump())
             return
 
         game_ended = room.game.place_stone(row, col, player.color)
@@ -176,7 +185,13 @@ class RoomManager:
             next_turn = room.game.current_turn
 
         await room.broadcast(
-            StonePlacedMsg(row=row, col=col, color=player.color, next_turn=next_turn).model_dump()
+            {
+                "type": "stone_placed",
+                "row": row,
+                "col": col,
+                "color": player.color,
+                "next_turn": next_turn,
+            }
         )
 
         if game_ended:
@@ -185,41 +200,37 @@ class RoomManager:
             else:
                 reason = "draw"
             await room.broadcast(
-                GameOverMsg(winner=room.game.winner, reason=reason).model_dump()
+                {"type": "game_over", "winner": room.game.winner, "reason": reason}
             )
             # Cancel turn timer
             if room.turn_timer_task and not room.turn_timer_task.done():
                 room.turn_timer_task.cancel()
         else:
             # Restart timer for next player's turn
-            self._start_turn_timer(room)
+            await self._start_turn_timer(room)
 
     async def reconnect(self, ws: WebSocket, room_id: str, player_token: str):
         room = self.rooms.get(room_id)
         if room is None:
-            await ws.send_json(ErrorMsg(message="Room not found").model_dump())
+            await send(ws, ErrorMsg(message="Room not found").model_dump())
             return
 
         player = room.get_player_by_token(player_token)
         if player is None:
-            await ws.send_json(ErrorMsg(message="Invalid player token").model_dump())
+            await send(ws, ErrorMsg(message="Invalid player token").model_dump())
             return
 
-        # Cancel the disconnect timeout task
-        disconnect_task = room.disconnect_tasks.pop(player_token, None)
-        if disconnect_task and not disconnect_task.done():
-            disconnect_task.cancel()
-
         # Replace the WebSocket connection
-        player.ws = ws
+        room.rebind_ws(player, ws)
         player.connected = True
-        self._ws_to_room[ws] = room_id
+        player.disconnect_deadline = 0.0
+        ws.state.room_id = room_id
 
         # Send full state sync to the reconnecting player
         await room.send_to(
             player,
             StateSyncMsg(
-                board=room.game.board,
+                board=room.game.board_string(),
                 current_turn=room.game.current_turn,
                 move_count=room.game.move_count,
                 your_color=player.color,
@@ -230,12 +241,13 @@ class RoomManager:
         # Notify opponent
         opponent = room.get_opponent(player)
         if opponent and opponent.connected:
-            await room.send_to(opponent, OpponentReconnectedMsg().model_dump())
+            await room.send_to(opponent, OPP_RECONNECTED_DICT)
 
     async def handle_disconnect(self, ws: WebSocket):
-        room_id = self._ws_to_room.pop(ws, None)
+        room_id = getattr(ws.state, "room_id", None)
         if room_id is None:
             return
+        ws.state.room_id = None
 
         room = self.rooms.get(room_id)
         if room is None:
@@ -249,22 +261,10 @@ class RoomManager:
         opponent = room.get_opponent(player)
 
         if opponent and opponent.connected:
-            await room.send_to(opponent, OpponentDisconnectedMsg().model_dump())
-
-            # Schedule room cleanup after 60 seconds if player doesn't reconnect
-            async def cleanup_after_timeout():
-                await asyncio.sleep(60)
-                if not player.connected:
-                    if not room.game.is_game_over and room.game_started:
-                        room.game.is_game_over = True
-                        room.game.winner = opponent.color
-                        await room.broadcast(
-                            GameOverMsg(winner=opponent.color, reason="disconnect").model_dump()
-                        )
-                    self._cleanup_room(room_id)
-
-            task = asyncio.create_task(cleanup_after_timeout())
-            room.disconnect_tasks[player.token] = task
+            await room.send_to(opponent, OPP_DISCONNECTED_DICT)
+
+            # The reaper cleans up the room if the player doesn't reconnect in time
+            player.disconnect_deadline = time.monotonic() + RECONNECT_TIMEOUT
         else:
             self._cleanup_room(room_id)
 
@@ -274,25 +274,52 @@ class RoomManager:
             return
         if room.turn_timer_task and not room.turn_timer_task.done():
             room.turn_timer_task.cancel()
-        for task in room.disconnect_tasks.values():
-            if not task.done():
-                task.cancel()
 
-    def _start_turn_timer(self, room: Room):
-        """Cancel existing timer and start a new 30-second countdown."""
-        if room.turn_timer_task and not room.turn_timer_task.done():
-            room.turn_timer_task.cancel()
-        room.turn_timer_start = time.monotonic()
+    def start_reaper(self):
+        """Start the background sweep that expires abandoned disconnects."""
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reaper_loop())
 
-        async def timer_loop():
-            remaining = float(TURN_TIMEOUT)
-            while remaining > 0:
-                await asyncio.sleep(min(TIMER_INTERVAL, remaining))
-                remaining -= TIMER_INTERVAL
-                if room.game.is_game_over:
-                    return
-                clamped = max(remaining, 0.0)
-                await room.broadcast(TurnTimerMsg(remaining=clamped).model_dump())
+    async def stop_reaper(self):
+        if self._reaper_task is None:
+            return
+        self._reaper_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._reaper_task
+        self._reaper_task = None
+
+    async def _reaper_loop(self):
+        while True:
+            await asyncio.sleep(REAPER_INTERVAL)
+            await self.reap_expired_disconnects(time.monotonic())
+
+    async def reap_expired_disconnects(self, now: float):
+        """Forfeit and clean up rooms whose disconnected player missed the deadline."""
+        for room_id, room in list(self.rooms.items()):
+            for player in (room.black, room.white):
+                if player is None or player.connected or player.disconnect_deadline == 0.0:
+                    continue
+                if now < player.disconnect_deadline:
+                    continue
+                opponent = room.get_opponent(player)
+                if opponent and not room.game.is_game_over and room.game_started:
+                    room.game.is_game_over = True
+                    room.game.winner = opponent.color
+                    await room.broadcast(
+                        {"type": "game_over", "winner": opponent.color, "reason": "disconnect"}
+                    )
+                self._cleanup_room(room_id)
+                break
+
+    async def _start_turn_timer(self, room: Room):
+        """Cancel existing timer, start a new 30-second countdown, and push the turn deadline.
+
+        Clients count down locally from the pushed deadline; the server only
+        wakes up again when the turn expires.
+        """
+
+        async def turn_timeout():
+            await asyncio.sleep(TURN_TIMEOUT)
 
             # Timeout — current player loses
             if not room.game.is_game_over:
@@ -301,13 +328,26 @@ class RoomManager:
                 room.game.is_game_over = True
                 room.game.winner = winner_color
                 await room.broadcast(
-                    GameOverMsg(winner=winner_color, reason="timeout").model_dump()
+                    {"type": "game_over", "winner": winner_color, "reason": "timeout"}
                 )
 
-        room.turn_timer_task = asyncio.create_task(timer_loop())
+        # Replace the timer before awaiting anything, so a move handled during
+        # the broadcast below cancels this task instead of orphaning it
+        if room.turn_timer_task and not room.turn_timer_task.done():
+            room.turn_timer_task.cancel()
+        room.turn_timer_start = time.monotonic()
+        room.turn_timer_task = asyncio.create_task(turn_timeout())
+
+        await room.broadcast(
+            {
+                "type": "turn_timer",
+                "remaining": float(TURN_TIMEOUT),
+                "deadline": time.time() + TURN_TIMEOUT,
+            }
+        )
 
     def get_room_for_ws(self, ws: WebSocket) -> Room | None:
-        room_id = self._ws_to_room.get(ws)
+        room_id = getattr(ws.state, "room_id", None)
         if room_id is None:
             return None
         return self.rooms.get(room_id)
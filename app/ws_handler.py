@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from app.codec import recv, send
 from app.models import (
     CreateRoomMsg,
     ErrorMsg,
@@ -21,10 +22,10 @@ async def websocket_endpoint(ws: WebSocket):
     await ws.accept()
     try:
         while True:
-            data = await ws.receive_json()
+            data = await recv(ws)
             msg = parse_client_message(data)
             if msg is None:
-                await ws.send_json(ErrorMsg(message="Unknown or invalid message").model_dump())
+                await send(ws, ErrorMsg(message="Unknown or invalid message").model_dump())
                 continue
 
             if isinstance(msg, CreateRoomMsg):
@@ -43,8 +44,9 @@ async def websocket_endpoint(ws: WebSocket):
                 await room_manager.handle_disconnect(ws)
 
             else:
-                await ws.send_json(
-                    ErrorMsg(message=f"Handler for '{msg.type}' not yet implemented").model_dump()
+                await send(
+                    ws,
+                    ErrorMsg(message=f"Handler for '{msg.type}' not yet implemented").model_dump(),
                 )
     except WebSocketDisconnect:
         await room_manager.handle_disconnect(ws)
@@ -0,0 +1,34 @@
+"""Shared pytest fixtures."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.room import RoomManager
+from tests.fakes import FakeWS
+
+
+@pytest_asyncio.fixture
+async def manager():
+    """Fresh RoomManager per test; its timers are torn down so none leak into the shared loop."""
+    manager = RoomManager()
+    yield manager
+    for room_id in list(manager.rooms):
+        manager._cleanup_room(room_id)
+    await asyncio.sleep(0)  # let cancelled timer tasks unwind
+
+
+@pytest.fixture
+def ws():
+    return FakeWS()
+
+
+@pytest.fixture
+def ws2():
+    return FakeWS()
+
+
+@pytest.fixture
+def ws3():
+    return FakeWS()
@@ -0,0 +1,27 @@
+"""Test doubles shared across test modules."""
+
+import asyncio
+import json
+
+from starlette.datastructures import State
+
+
+class FakeWS:
+    """Stand-in WebSocket that records every frame sent to it."""
+
+    def __init__(self):
+        self.state = State()
+        self.frames: list[str] = []  # raw text frames
+        self.sent: list[dict] = []  # decoded messages
+
+    async def send_text(self, data: str):
+        self.frames.append(data)
+        self.sent.append(json.loads(data))
+
+
+class YieldingFakeWS(FakeWS):
+    """FakeWS whose sends yield to the event loop, like a real socket write can."""
+
+    async def send_text(self, data: str):
+        await asyncio.sleep(0)
+        await super().send_text(data)
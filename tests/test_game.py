@@ -1,125 +1,144 @@
 """Unit tests for game logic: win detection, move validation, draw."""
 
-from app.game import BOARD_SIZE, GameState
+import pytest
+
+from app.game import BOARD_SIZE, ZOBRIST, GameState
+
+# (direction, black stones with the winning move last, white replies)
+WIN_CASES = [
+    ("horizontal", [(7, 3 + i) for i in range(5)], [(8, 3 + i) for i in range(4)]),
+    ("vertical", [(3 + i, 7) for i in range(5)], [(3 + i, 8) for i in range(4)]),
+    ("diagonal_down_right", [(i, i) for i in range(5)], [(i, i + 1) for i in range(4)]),
+    ("diagonal_up_right", [(4 - i, i) for i in range(5)], [(0, 5 + i) for i in range(4)]),
+]
+
+
+@pytest.fixture
+def game():
+    return GameState()
+
+
+def preplace(game: GameState, coords, color: str):
+    """Put setup stones straight onto the bitboards and hash, skipping per-move win checks."""
+    for r, c in coords:
+        idx = r * BOARD_SIZE + c
+        if color == "black":
+            game.black |= 1 << idx
+            game.hash ^= ZOBRIST[idx][0]
+        else:
+            game.white |= 1 << idx
+            game.hash ^= ZOBRIST[idx][1]
+    game.move_count += len(coords)
 
 
 class TestMoveValidation:
-    def test_valid_move(self):
-        game = GameState()
+    def test_valid_move(self, game):
         assert game.validate_move(7, 7, "black") is None
 
-    def test_wrong_turn(self):
-        game = GameState()
+    def test_wrong_turn(self, game):
         assert game.validate_move(0, 0, "white") == "Not your turn"
 
-    def test_out_of_bounds(self):
-        game = GameState()
-        assert game.validate_move(-1, 0, "black") == "Coordinates out of bounds"
-        assert game.validate_move(0, BOARD_SIZE, "black") == "Coordinates out of bounds"
-        assert game.validate_move(BOARD_SIZE, 0, "black") == "Coordinates out of bounds"
+    @pytest.mark.parametrize("row, col", [(-1, 0), (0, BOARD_SIZE), (BOARD_SIZE, 0)])
+    def test_out_of_bounds(self, game, row, col):
+        assert game.validate_move(row, col, "black") == "Coordinates out of bounds"
 
-    def test_occupied_cell(self):
-        game = GameState()
+    def test_occupied_cell(self, game):
         game.place_stone(7, 7, "black")
         assert game.validate_move(7, 7, "white") == "Cell is already occupied"
 
-    def test_game_over(self):
-        game = GameState()
+    def test_game_over(self, game):
         game.is_game_over = True
         assert game.validate_move(0, 0, "black") == "Game is already over"
 
 
 class TestPlaceStone:
-    def test_alternating_turns(self):
-        game = GameState()
+    def test_alternating_turns(self, game):
         game.place_stone(0, 0, "black")
         assert game.current_turn == "white"
         game.place_stone(1, 0, "white")
         assert game.current_turn == "black"
 
-    def test_move_count(self):
-        game = GameState()
+    def test_move_count(self, game):
         game.place_stone(0, 0, "black")
         assert game.move_count == 1
         game.place_stone(1, 0, "white")
         assert game.move_count == 2
 
+    def test_board_string(self, game):
+        game.place_stone(0, 1, "black")
+        game.place_stone(14, 14, "white")
+        board = game.board_string()
+        assert len(board) == BOARD_SIZE * BOARD_SIZE
+        assert board[:3] == ".B."
+        assert board[-1] == "W"
+        assert board.count(".") == BOARD_SIZE * BOARD_SIZE - 2
+
+    def test_hash_depends_on_position_not_move_order(self):
+        game1, game2 = GameState(), GameState()
+        for r, c, color in [(0, 0, "black"), (1, 1, "white"), (2, 2, "black")]:
+            game1.place_stone(r, c, color)
+        for r, c, color in [(2, 2, "black"), (1, 1, "white"), (0, 0, "black")]:
+            game2.place_stone(r, c, color)
+        assert game1.hash == game2.hash != 0
+        assert game1.board_string() == game2.board_string()
+
+        board = game1.board_string()
+        assert game1.board_string() is board
+        game1.place_stone(3, 3, "white")
+        assert game1.hash != game2.hash
+        assert game1.board_string() != board
 
-class TestWinDetection:
-    def test_horizontal_win(self):
-        game = GameState()
-        # black: (7,3), (7,4), (7,5), (7,6), (7,7)
-        # white: (8,3), (8,4), (8,5), (8,6)
-        for i in range(4):
-            game.place_stone(7, 3 + i, "black")
-            game.place_stone(8, 3 + i, "white")
-        ended = game.place_stone(7, 7, "black")
-        assert ended is True
-        assert game.winner == "black"
-
-    def test_vertical_win(self):
-        game = GameState()
-        for i in range(4):
-            game.place_stone(3 + i, 7, "black")
-            game.place_stone(3 + i, 8, "white")
-        ended = game.place_stone(7, 7, "black")
-        assert ended is True
-        assert game.winner == "black"
 
-    def test_diagonal_down_right_win(self):
-        game = GameState()
-        # black: (0,0), (1,1), (2,2), (3,3), (4,4)
-        for i in range(4):
-            game.place_stone(i, i, "black")
-            game.place_stone(i, i + 1, "white")
-        ended = game.place_stone(4, 4, "black")
-        assert ended is True
-        assert game.winner == "black"
-
-    def test_diagonal_up_right_win(self):
-        game = GameState()
-        # black: (4,0), (3,1), (2,2), (1,3), (0,4)
-        for i in range(4):
-            game.place_stone(4 - i, i, "black")
-            game.place_stone(0, 5 + i, "white")
-        ended = game.place_stone(0, 4, "black")
+class TestWinDetection:
+    @pytest.mark.parametrize("name, black, white", WIN_CASES, ids=[c[0] for c in WIN_CASES])
+    def test_directional_win(self, game, name, black, white):
+        preplace(game, black[:-1], "black")
+        preplace(game, white, "white")
+        ended = game.place_stone(*black[-1], "black")
         assert ended is True
         assert game.winner == "black"
 
-    def test_no_win_with_four(self):
-        game = GameState()
-        for i in range(3):
-            game.place_stone(7, 3 + i, "black")
-            game.place_stone(8, 3 + i, "white")
+    def test_no_win_with_four(self, game):
+        preplace(game, [(7, 3 + i) for i in range(3)], "black")
+        preplace(game, [(8, 3 + i) for i in range(3)], "white")
         ended = game.place_stone(7, 6, "black")
         assert ended is False
         assert game.winner is None
 
-    def test_white_wins(self):
-        game = GameState()
+    def test_no_win_across_row_edge(self, game):
+        # black: (0,12), (0,13), (0,14), (1,0), (1,1) are adjacent bits but not a line
+        preplace(game, [(0, 12), (0, 13), (0, 14), (1, 0)], "black")
+        preplace(game, [(10, i) for i in range(4)], "white")
+        ended = game.place_stone(1, 1, "black")
+        assert ended is False
+        assert game.winner is None
+
+    def test_white_wins(self, game):
         # black goes first at (0,0), then white builds horizontal
-        game.place_stone(0, 0, "black")
-        for i in range(4):
-            game.place_stone(7, i, "white")
-            game.place_stone(1, i, "black")
+        preplace(game, [(0, 0)] + [(1, i) for i in range(4)], "black")
+        preplace(game, [(7, i) for i in range(4)], "white")
+        game.current_turn = "white"
         ended = game.place_stone(7, 4, "white")
         assert ended is True
         assert game.winner == "white"
 
 
 class TestDraw:
-    def test_draw_detection(self):
-        game = GameState()
+    def test_draw_detection(self, game):
         assert game.is_draw() is False
         game.move_count = BOARD_SIZE * BOARD_SIZE
         assert game.is_draw() is True
 
-    def test_full_board_draw(self):
-        game = GameState()
-        game.move_count = BOARD_SIZE * BOARD_SIZE - 1
-        # Place last stone without winning
-        game.board[14][14] = None
-        ended = game.place_stone(14, 14, "black")
-        # May or may not be draw depending on board state,
-        # but move_count should trigger draw if no win
+    def test_full_board_draw(self, game):
+        # Fill every cell but the last with a pattern that has no line of five:
+        # colors alternate along rows and every other row pair
+        last = (14, 13)
+        cells = [(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE) if (r, c) != last]
+        preplace(game, [(r, c) for r, c in cells if (r // 2 + c) % 2 == 0], "black")
+        preplace(game, [(r, c) for r, c in cells if (r // 2 + c) % 2 == 1], "white")
+        assert game.move_count == BOARD_SIZE * BOARD_SIZE - 1
+
+        ended = game.place_stone(*last, "black")
+        assert ended is True
+        assert game.winner is None
         assert game.move_count == BOARD_SIZE * BOARD_SIZE
@@ -0,0 +1,32 @@
+"""Tests for client message parsing."""
+
+from app.models import JoinRoomMsg, PlaceStoneMsg, ReconnectMsg, parse_client_message
+
+
+class TestParseClientMessage:
+    def test_place_stone(self):
+        msg = parse_client_message({"type": "place_stone", "row": 7, "col": 8})
+        assert isinstance(msg, PlaceStoneMsg)
+        assert (msg.row, msg.col) == (7, 8)
+
+    def test_place_stone_coerces_numeric_strings(self):
+        msg = parse_client_message({"type": "place_stone", "row": "7", "col": 8})
+        assert isinstance(msg, PlaceStoneMsg)
+        assert msg.row == 7
+
+    def test_place_stone_missing_field(self):
+        assert parse_client_message({"type": "place_stone", "row": 7}) is None
+
+    def test_join_room(self):
+        msg = parse_client_message({"type": "join_room", "room_id": "abc123"})
+        assert isinstance(msg, JoinRoomMsg)
+        assert msg.room_id == "abc123"
+
+    def test_reconnect_invalid_token(self):
+        msg = parse_client_message({"type": "reconnect", "room_id": "abc123", "player_token": None})
+        assert msg is None
+        msg = parse_client_message({"type": "reconnect", "room_id": "abc123", "player_token": "t"})
+        assert isinstance(msg, ReconnectMsg)
+
+    def test_unknown_type(self):
+        assert parse_client_message({"type": "unknown_type"}) is None
@@ -1,123 +1,207 @@
 """Tests for room lifecycle: creation, joining, leaving."""
 
-import pytest
-from unittest.mock import AsyncMock, MagicMock
+import asyncio
+import json
+import time
 
-from app.room import RoomManager
+import pytest
 
+from app import room as room_module
+from app.models import GameOverMsg, RoomCreatedMsg, StonePlacedMsg, TurnTimerMsg
+from app.room import RECONNECT_TIMEOUT, TURN_TIMEOUT
+from tests.fakes import YieldingFakeWS
 
-def make_mock_ws():
-    """Create a mock WebSocket that tracks sent messages."""
-    ws = AsyncMock()
-    ws.send_json = AsyncMock()
-    return ws
+# All room tests share one event loop instead of building a new one per test
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
 class TestRoomCreation:
-    @pytest.mark.asyncio
-    async def test_create_room(self):
-        manager = RoomManager()
-        ws = make_mock_ws()
+    async def test_create_room(self, manager, ws):
         room = await manager.create_room(ws)
 
         assert room is not None
         assert len(room.room_id) == 6
-        assert len(room.players) == 1
-        assert room.players[0].color == "black"
+        assert room.black.color == "black"
+        assert room.white is None
         assert room.room_id in manager.rooms
 
         # Verify room_created message was sent
-        ws.send_json.assert_called_once()
-        msg = ws.send_json.call_args[0][0]
+        assert len(ws.sent) == 1
+        msg = ws.sent[-1]
         assert msg["type"] == "room_created"
         assert msg["color"] == "black"
         assert "player_token" in msg
+        assert RoomCreatedMsg.model_validate(msg).model_dump() == msg
 
-    @pytest.mark.asyncio
-    async def test_create_multiple_rooms(self):
-        manager = RoomManager()
-        ws1, ws2 = make_mock_ws(), make_mock_ws()
-        room1 = await manager.create_room(ws1)
+    async def test_create_multiple_rooms(self, manager, ws, ws2):
+        room1 = await manager.create_room(ws)
         room2 = await manager.create_room(ws2)
         assert room1.room_id != room2.room_id
         assert len(manager.rooms) == 2
 
 
 class TestRoomJoining:
-    @pytest.mark.asyncio
-    async def test_join_room(self):
-        manager = RoomManager()
-        ws1, ws2 = make_mock_ws(), make_mock_ws()
-        room = await manager.create_room(ws1)
+    async def test_join_room(self, manager, ws, ws2):
+        room = await manager.create_room(ws)
 
         await manager.join_room(ws2, room.room_id)
 
-        assert len(room.players) == 2
-        assert room.players[1].color == "white"
+        assert room.white.color == "white"
         assert room.game_started is True
 
-    @pytest.mark.asyncio
-    async def test_join_nonexistent_room(self):
-        manager = RoomManager()
-        ws = make_mock_ws()
+    async def test_join_nonexistent_room(self, manager, ws):
         result = await manager.join_room(ws, "nonexistent")
         assert result is None
-        ws.send_json.assert_called_once()
-        msg = ws.send_json.call_args[0][0]
+        assert len(ws.sent) == 1
+        msg = ws.sent[-1]
         assert msg["type"] == "error"
         assert "not found" in msg["message"].lower()
 
-    @pytest.mark.asyncio
-    async def test_join_full_room(self):
-        manager = RoomManager()
-        ws1, ws2, ws3 = make_mock_ws(), make_mock_ws(), make_mock_ws()
-        room = await manager.create_room(ws1)
+    async def test_join_full_room(self, manager, ws, ws2, ws3):
+        room = await manager.create_room(ws)
         await manager.join_room(ws2, room.room_id)
 
         result = await manager.join_room(ws3, room.room_id)
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_game_started_broadcast(self):
-        manager = RoomManager()
-        ws1, ws2 = make_mock_ws(), make_mock_ws()
-        room = await manager.create_room(ws1)
+    async def test_game_started_broadcast(self, manager, ws, ws2):
+        room = await manager.create_room(ws)
         await manager.join_room(ws2, room.room_id)
 
-        # ws1 should receive: room_created, player_joined, game_started
-        assert ws1.send_json.call_count == 3
-        msgs = [call[0][0] for call in ws1.send_json.call_args_list]
+        # ws should receive: room_created, player_joined, game_started, turn_timer
+        msgs = ws.sent
+        assert len(msgs) == 4
         types = [m["type"] for m in msgs]
         assert "room_created" in types
         assert "player_joined" in types
         assert "game_started" in types
+        assert types[-1] == "turn_timer"
 
-        # ws2 should receive: room_created, game_started
-        assert ws2.send_json.call_count == 2
+        # ws2 should receive: room_created, game_started, turn_timer
+        assert len(ws2.sent) == 3
 
 
 class TestRoomLeaving:
-    @pytest.mark.asyncio
-    async def test_disconnect_solo_player_cleans_room(self):
-        manager = RoomManager()
-        ws = make_mock_ws()
+    async def test_disconnect_solo_player_cleans_room(self, manager, ws):
         room = await manager.create_room(ws)
         room_id = room.room_id
 
         await manager.handle_disconnect(ws)
         assert room_id not in manager.rooms
 
-    @pytest.mark.asyncio
-    async def test_disconnect_notifies_opponent(self):
-        manager = RoomManager()
-        ws1, ws2 = make_mock_ws(), make_mock_ws()
-        room = await manager.create_room(ws1)
+    async def test_disconnect_notifies_opponent(self, manager, ws, ws2):
+        room = await manager.create_room(ws)
         await manager.join_room(ws2, room.room_id)
-        ws2.send_json.reset_mock()
+        ws2.sent.clear()
 
-        await manager.handle_disconnect(ws1)
+        await manager.handle_disconnect(ws)
 
         # ws2 should receive opponent_disconnected
-        ws2.send_json.assert_called()
-        last_msg = ws2.send_json.call_args[0][0]
+        assert ws2.sent
+        last_msg = ws2.sent[-1]
         assert last_msg["type"] == "opponent_disconnected"
+
+    async def test_expired_disconnect_forfeits(self, manager, ws, ws2):
+        room = await manager.create_room(ws)
+        await manager.join_room(ws2, room.room_id)
+        await manager.handle_disconnect(ws)
+
+        # Still inside the reconnect window
+        await manager.reap_expired_disconnects(time.monotonic())
+        assert room.room_id in manager.rooms
+
+        await manager.reap_expired_disconnects(time.monotonic() + RECONNECT_TIMEOUT)
+        assert room.room_id not in manager.rooms
+        last_msg = ws2.sent[-1]
+        assert last_msg["type"] == "game_over"
+        assert last_msg["winner"] == "white"
+        assert last_msg["reason"] == "disconnect"
+        assert GameOverMsg.model_validate(last_msg).model_dump() == last_msg
+
+
+class TestTurnTimer:
+    async def test_turn_timer_pushes_deadline(self, manager, ws, ws2):
+        room = await manager.create_room(ws)
+        before = time.time()
+        await manager.join_room(ws2, room.room_id)
+
+        timer = ws2.sent[-1]
+        assert timer["type"] == "turn_timer"
+        assert timer["remaining"] == TURN_TIMEOUT
+        assert before + TURN_TIMEOUT <= timer["deadline"] <= time.time() + TURN_TIMEOUT
+
+        await manager.place_stone(ws, 7, 7)
+        stone, timer = ws2.sent[-2:]
+        assert StonePlacedMsg.model_validate(stone).model_dump() == stone
+        assert TurnTimerMsg.model_validate(timer).model_dump() == timer
+
+    async def test_timeout_forfeits_current_player(self, manager, ws, ws2, monkeypatch):
+        monkeypatch.setattr(room_module, "TURN_TIMEOUT", 0.01)
+        room = await manager.create_room(ws)
+        await manager.join_room(ws2, room.room_id)
+
+        await asyncio.sleep(0.05)
+
+        assert room.game.is_game_over is True
+        for player_ws in (ws, ws2):
+            last_msg = player_ws.sent[-1]
+            assert GameOverMsg.model_validate(last_msg).model_dump() == last_msg
+            assert last_msg["winner"] == "white"
+            assert last_msg["reason"] == "timeout"
+
+    async def test_concurrent_moves_leave_one_timer(self, manager, monkeypatch):
+        monkeypatch.setattr(room_module, "TURN_TIMEOUT", 0.05)
+
+        def live_timers():
+            return {
+                t
+                for t in asyncio.all_tasks()
+                if t.get_coro().__qualname__.endswith("turn_timeout") and not t.done()
+            }
+
+        earlier = live_timers()
+        black, white = YieldingFakeWS(), YieldingFakeWS()
+        room = await manager.create_room(black)
+        await manager.join_room(white, room.room_id)
+
+        # White moves while black's move is still broadcasting
+        await asyncio.gather(manager.place_stone(black, 7, 7), manager.place_stone(white, 8, 8))
+        assert room.game.move_count == 2
+        assert live_timers() - earlier == {room.turn_timer_task}
+
+        await asyncio.sleep(0.1)
+        game_overs = [m for m in black.sent if m["type"] == "game_over"]
+        assert len(game_overs) == 1
+        assert game_overs[0]["reason"] == "timeout"
+        assert game_overs[0]["winner"] == "white"
+
+
+class TestReconnect:
+    async def test_reconnect_sends_state_sync(self, manager, ws, ws2, ws3):
+        room = await manager.create_room(ws)
+        token = ws.sent[0]["player_token"]
+        await manager.join_room(ws2, room.room_id)
+        await manager.place_stone(ws, 7, 7)
+        await manager.handle_disconnect(ws)
+
+        await manager.reconnect(ws3, room.room_id, token)
+
+        sync = ws3.sent[0]
+        assert sync["type"] == "state_sync"
+        assert sync["board"][7 * 15 + 7] == "B"
+        assert sync["board"].count(".") == 15 * 15 - 1
+        assert sync["your_color"] == "black"
+        assert ws2.sent[-1]["type"] == "opponent_reconnected"
+
+
+class TestBroadcast:
+    async def test_broadcast_encodes_once(self, manager, ws, ws2):
+        room = await manager.create_room(ws)
+        await manager.join_room(ws2, room.room_id)
+
+        await room.broadcast({"type": "turn_timer", "remaining": 5.0})
+
+        payload1 = ws.frames[-1]
+        payload2 = ws2.frames[-1]
+        assert payload1 is payload2
+        assert json.loads(payload1) == {"type": "turn_timer", "remaining": 5.0}
@@ -1,126 +1,161 @@
 """WebSocket integration tests using FastAPI TestClient."""
 
+import httpx
+import orjson
 import pytest
-from starlette.testclient import TestClient
+from starlette.testclient import TestClient, WebSocketTestSession
 
 from app.main import app
 
 
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient (and one app lifespan) shared by every test."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="module", autouse=True)
+def orjson_test_session():
+    """Encode/decode the test client's JSON frames with orjson, like the server does."""
+
+    def send_json(self, data):
+        self.send_text(orjson.dumps(data).decode())
+
+    def receive_json(self):
+        return orjson.loads(self.receive_text())
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(WebSocketTestSession, "send_json", send_json)
+        mp.setattr(WebSocketTestSession, "receive_json", receive_json)
+        yield
+
+
+def expect(ws, *types: str) -> list[dict]:
+    """Receive exactly len(types) messages and assert they arrive in that order."""
+    msgs = [ws.receive_json() for _ in types]
+    assert [m["type"] for m in msgs] == list(types)
+    return msgs
+
+
+@pytest.fixture
+def two_player_ws(client):
+    """Black and white connected to one room, with the join handshake drained."""
+    with client.websocket_connect("/ws") as ws1, client.websocket_connect("/ws") as ws2:
+        ws1.send_json({"type": "create_room"})
+        room_id = expect(ws1, "room_created")[0]["room_id"]
+        ws2.send_json({"type": "join_room", "room_id": room_id})
+        expect(ws2, "room_created", "game_started", "turn_timer")
+        expect(ws1, "player_joined", "game_started", "turn_timer")
+        yield ws1, ws2, room_id
+
+
+@pytest.fixture(scope="module")
+def played_out_game(client):
+    """Two players create, join, and play until black wins; runs once per module.
+
+    Yields the messages each player received, keyed by player then message type
+    (stone_placed collects every stone in order).
+    """
+    msgs = {"ws1": {"stone_placed": []}, "ws2": {"stone_placed": []}}
+
+    def record(key, received):
+        for m in received:
+            if m["type"] == "stone_placed":
+                msgs[key]["stone_placed"].append(m)
+            else:
+                msgs[key][m["type"]] = m
+
+    with client.websocket_connect("/ws") as ws1, client.websocket_connect("/ws") as ws2:
+        # Player 1 creates room, player 2 joins
+        ws1.send_json({"type": "create_room"})
+        record("ws1", expect(ws1, "room_created"))
+        room_id = msgs["ws1"]["room_created"]["room_id"]
+        ws2.send_json({"type": "join_room", "room_id": room_id})
+        record("ws2", expect(ws2, "room_created", "game_started", "turn_timer"))
+        record("ws1", expect(ws1, "player_joined", "game_started", "turn_timer"))
+
+        # Play moves: black wins with horizontal line
+        # Black: (7,0), (7,1), (7,2), (7,3), (7,4)
+        # White: (8,0), (8,1), (8,2), (8,3)
+        for i in range(4):
+            ws1.send_json({"type": "place_stone", "row": 7, "col": i})
+            record("ws1", expect(ws1, "stone_placed", "turn_timer"))
+            record("ws2", expect(ws2, "stone_placed", "turn_timer"))
+
+            ws2.send_json({"type": "place_stone", "row": 8, "col": i})
+            record("ws1", expect(ws1, "stone_placed", "turn_timer"))
+            record("ws2", expect(ws2, "stone_placed", "turn_timer"))
+
+        # Black's winning move
+        ws1.send_json({"type": "place_stone", "row": 7, "col": 4})
+        record("ws1", expect(ws1, "stone_placed", "game_over"))
+        record("ws2", expect(ws2, "stone_placed", "game_over"))
+
+        yield msgs
+
+
 class TestWebSocketIntegration:
-    def test_health_endpoint(self):
-        with TestClient(app) as client:
-            resp = client.get("/health")
-            assert resp.status_code == 200
-            assert resp.json() == {"status": "ok"}
-
-    def test_websocket_connect(self):
-        with TestClient(app) as client:
-            with client.websocket_connect("/ws") as ws:
-                ws.send_json({"type": "create_room"})
-                data = ws.receive_json()
-                assert data["type"] == "room_created"
-                assert data["color"] == "black"
-                assert len(data["room_id"]) == 6
-
-    def test_invalid_message(self):
-        with TestClient(app) as client:
-            with client.websocket_connect("/ws") as ws:
-                ws.send_json({"type": "unknown_type"})
-                data = ws.receive_json()
-                assert data["type"] == "error"
-
-    def test_full_game_flow(self):
-        """Two players create, join, and play until someone wins."""
-        with TestClient(app) as client:
-            with client.websocket_connect("/ws") as ws1:
-                # Player 1 creates room
-                ws1.send_json({"type": "create_room"})
-                msg1 = ws1.receive_json()
-                assert msg1["type"] == "room_created"
-                room_id = msg1["room_id"]
-
-                with client.websocket_connect("/ws") as ws2:
-                    # Player 2 joins
-                    ws2.send_json({"type": "join_room", "room_id": room_id})
-                    msg2 = ws2.receive_json()
-                    assert msg2["type"] == "room_created"
-                    assert msg2["color"] == "white"
-
-                    # Player 1 receives player_joined + game_started
-                    p1_joined = ws1.receive_json()
-                    assert p1_joined["type"] == "player_joined"
-                    p1_started = ws1.receive_json()
-                    assert p1_started["type"] == "game_started"
-                    assert p1_started["your_color"] == "black"
-
-                    # Player 2 receives game_started
-                    p2_started = ws2.receive_json()
-                    assert p2_started["type"] == "game_started"
-                    assert p2_started["your_color"] == "white"
-
-                    # Play moves: black wins with horizontal line
-                    # Black: (7,0), (7,1), (7,2), (7,3), (7,4)
-                    # White: (8,0), (8,1), (8,2), (8,3)
-                    for i in range(4):
-                        # Black's move
-                        ws1.send_json({"type": "place_stone", "row": 7, "col": i})
-                        s1 = ws1.receive_json()
-                        assert s1["type"] == "stone_placed"
-                        assert s1["color"] == "black"
-                        s2 = ws2.receive_json()
-                        assert s2["type"] == "stone_placed"
-
-                        # White's move
-                        ws2.send_json({"type": "place_stone", "row": 8, "col": i})
-                        s1 = ws1.receive_json()
-                        assert s1["type"] == "stone_placed"
-                        assert s1["color"] == "white"
-                        s2 = ws2.receive_json()
-                        assert s2["type"] == "stone_placed"
-
-                    # Black's winning move
-                    ws1.send_json({"type": "place_stone", "row": 7, "col": 4})
-                    s1 = ws1.receive_json()
-                    assert s1["type"] == "stone_placed"
-                    assert s1["color"] == "black"
-
-                    # Game over for player 1
-                    go1 = ws1.receive_json()
-                    assert go1["type"] == "game_over"
-                    assert go1["winner"] == "black"
-                    assert go1["reason"] == "five_in_row"
-
-                    # Player 2 also receives stone_placed + game_over
-                    s2 = ws2.receive_json()
-                    assert s2["type"] == "stone_placed"
-                    go2 = ws2.receive_json()
-                    assert go2["type"] == "game_over"
-                    assert go2["winner"] == "black"
-
-    def test_wrong_turn_rejected(self):
-        with TestClient(app) as client:
-            with client.websocket_connect("/ws") as ws1:
-                ws1.send_json({"type": "create_room"})
-                msg = ws1.receive_json()
-                room_id = msg["room_id"]
-
-                with client.websocket_connect("/ws") as ws2:
-                    ws2.send_json({"type": "join_room", "room_id": room_id})
-                    ws2.receive_json()  # room_created
-                    ws1.receive_json()  # player_joined
-                    ws1.receive_json()  # game_started
-                    ws2.receive_json()  # game_started
-
-                    # White tries to move first — should fail
-                    ws2.send_json({"type": "place_stone", "row": 7, "col": 7})
-                    err = ws2.receive_json()
-                    assert err["type"] == "error"
-                    assert "not your turn" in err["message"].lower()
-
-    def test_join_nonexistent_room(self):
-        with TestClient(app) as client:
-            with client.websocket_connect("/ws") as ws:
-                ws.send_json({"type": "join_room", "room_id": "bad123"})
-                data = ws.receive_json()
-                assert data["type"] == "error"
-                assert "not found" in data["message"].lower()
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_health_endpoint(self):
+        # Plain HTTP runs in-process on the test's loop, no TestClient thread hop
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            resp = await http.get("/health")
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "ok"}
+
+    def test_websocket_connect(self, client):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "create_room"})
+            data = ws.receive_json()
+            assert data["type"] == "room_created"
+            assert data["color"] == "black"
+            assert len(data["room_id"]) == 6
+
+    def test_invalid_message(self, client):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "unknown_type"})
+            data = ws.receive_json()
+            assert data["type"] == "error"
+
+    def test_players_get_colors(self, played_out_game):
+        msgs = played_out_game
+        assert msgs["ws1"]["room_created"]["color"] == "black"
+        assert msgs["ws2"]["room_created"]["color"] == "white"
+        assert msgs["ws1"]["game_started"]["your_color"] == "black"
+        assert msgs["ws2"]["game_started"]["your_color"] == "white"
+
+    def test_stones_reported_to_both_players(self, played_out_game):
+        msgs = played_out_game
+        expected_colors = ["black", "white"] * 4 + ["black"]
+        for key in ("ws1", "ws2"):
+            stones = msgs[key]["stone_placed"]
+            assert [s["color"] for s in stones] == expected_colors
+            assert stones[-1]["next_turn"] is None
+
+    def test_black_wins_reported_to_both_players(self, played_out_game):
+        msgs = played_out_game
+        assert msgs["ws1"]["game_over"]["winner"] == "black"
+        assert msgs["ws2"]["game_over"]["winner"] == "black"
+
+    def test_game_over_reason_is_five_in_row(self, played_out_game):
+        msgs = played_out_game
+        assert msgs["ws1"]["game_over"]["reason"] == "five_in_row"
+        assert msgs["ws2"]["game_over"]["reason"] == "five_in_row"
+
+    def test_wrong_turn_rejected(self, two_player_ws):
+        _, ws2, _ = two_player_ws
+
+        # White tries to move first — should fail
+        ws2.send_json({"type": "place_stone", "row": 7, "col": 7})
+        err = ws2.receive_json()
+        assert err["type"] == "error"
+        assert "not your turn" in err["message"].lower()
+
+    def test_join_nonexistent_room(self, client):
+        with client.websocket_connect("/ws") as ws:
+            ws.send_json({"type": "join_room", "room_id": "bad123"})
+            data = ws.receive_json()
+            assert data["type"] == "error"
+            assert "not found" in data["message"].lower()